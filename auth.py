@@ -1,22 +1,254 @@
 import hashlib
 import os
 import json
-from typing import Dict, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# One lock per shard file, shared by every AuthenticationManager in the process
+_shard_locks = {}
+_shard_locks_guard = threading.Lock()
+
+def _get_shard_lock(path: str) -> threading.Lock:
+    """Return the process-wide lock guarding a shard file"""
+    key = os.path.abspath(path)
+    with _shard_locks_guard:
+        lock = _shard_locks.get(key)
+        if lock is None:
+            lock = _shard_locks[key] = threading.Lock()
+        return lock
+
+def _iter_json_object(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally decode the members of a file holding one JSON object
+    
+    Members are decoded one at a time from a buffer that is refilled in
+    chunks and trimmed as it is consumed, so memory is bounded by the
+    largest member plus one chunk rather than by the size of the file.
+    
+    Args:
+        f (TextIO): File positioned at the start of the object
+        chunk_size (int): Characters read per refill
+    
+    Yields:
+        Tuple[str, Any]: Each key and its decoded value, in file order
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\n\r':
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+    
+    def expect(chars):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] not in chars:
+            raise ValueError(f"Malformed JSON object in {f.name}: expected one of {chars!r}")
+        pos += 1
+        return buffer[pos - 1]
+    
+    def decode():
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the buffer edge may have been cut short
+                if end < len(buffer) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+    
+    expect('{')
+    skip_whitespace()
+    if buffer.startswith('}', pos):
+        return
+    
+    while True:
+        key = decode()
+        expect(':')
+        yield key, decode()
+        if expect(',}') == '}':
+            return
 
 class AuthenticationManager:
-    def __init__(self, database_path='users.json'):
+    def __init__(self, database_path='users.json', num_shards=None, create=True, reshard=False):
         """
         Initialize authentication manager with a JSON file database
         
+        With more than one shard, users are partitioned by username hash
+        into ``<name>.shard<i><ext>`` files next to ``database_path``. An
+        update reads and rewrites only the shard holding the user, so its
+        cost grows with the users per shard rather than with all users. Each
+        shard has its own lock held across the read-modify-write so that
+        concurrent updates are never lost.
+        
+        The shard count is recorded in ``<name>.meta<ext>`` and an existing
+        store is never silently read with a different count: a single-file
+        database is split into shards automatically, any other change needs
+        ``reshard=True``.
+        
         Args:
             database_path (str): Path to the user database file
+            num_shards (Optional[int]): Number of shard files to partition users
+                across, None to use the stored count (1 for a new database)
+            create (bool): Whether a missing database may be created; when False
+                no file is written and a missing database raises FileNotFoundError
+            reshard (bool): Whether to repartition a store saved with a
+                different shard count instead of raising ValueError
+        
+        Completed matches are appended to ``<name>.matches.jsonl`` next to
+        the database.
         """
+        if num_shards is not None and num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        
         self.database_path = database_path
+        root, ext = os.path.splitext(database_path)
+        self.meta_path = f"{root}.meta{ext or '.json'}"
+        self.matches_path = f"{root}.matches.jsonl"
+        self.matches_lock = _get_shard_lock(self.matches_path)
+        
+        with _shard_locks_guard:
+            stored_shards = self._stored_num_shards()
+            if stored_shards is None and not create:
+                raise FileNotFoundError(f"No user database at {database_path}")
+            
+            self.num_shards = num_shards or stored_shards or 1
+            self.shard_paths = self._build_shard_paths(self.num_shards)
+            
+            if stored_shards is not None and stored_shards != self.num_shards:
+                # A single-file database never overlaps the shard files
+                if not create or not (reshard or stored_shards == 1):
+                    raise ValueError(
+                        f"{database_path} is stored in {stored_shards} shard(s), not "
+                        f"{self.num_shards}; pass reshard=True to repartition it"
+                    )
+                self._reshard(stored_shards)
+            elif create:
+                # Create shard files if they don't exist
+                for index, path in enumerate(self.shard_paths):
+                    if not os.path.exists(path):
+                        self._save_shard(index, {})
+                self._save_meta()
+        
+        self.shard_locks = [_get_shard_lock(path) for path in self.shard_paths]
+    
+    def _build_shard_paths(self, num_shards: int) -> List[str]:
+        """Compute the file path of every shard for a shard count"""
+        if num_shards == 1:
+            return [self.database_path]
+        
+        root, ext = os.path.splitext(self.database_path)
+        return [f"{root}.shard{i}{ext or '.json'}" for i in range(num_shards)]
+    
+    def _stored_num_shards(self) -> Optional[int]:
+        """
+        Determine how many shards the existing store was written with
+        
+        Returns:
+            Optional[int]: Stored shard count, or None if there is no store yet
+        """
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r') as f:
+                return json.load(f)['num_shards']
+        
+        # Stores written before the metadata file existed
+        root, ext = os.path.splitext(self.database_path)
+        count = 0
+        while os.path.exists(f"{root}.shard{count}{ext or '.json'}"):
+            count += 1
+        if count:
+            return count
+        return 1 if os.path.exists(self.database_path) else None
+    
+    def _save_meta(self) -> None:
+        """Record the shard count next to the database"""
+        tmp_path = f"{self.meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'num_shards': self.num_shards}, f, indent=4)
+        os.replace(tmp_path, self.meta_path)
+    
+    def _reshard(self, stored_shards: int) -> None:
+        """
+        Repartition a store written with a different shard count
+        
+        All users are loaded before anything is written, and the metadata is
+        only updated once every new shard is in place, so an interrupted run
+        is simply repeated from the old layout on the next start.
+        """
+        old_paths = self._build_shard_paths(stored_shards)
+        users = {}
+        for path in old_paths:
+            with open(path, 'r') as f:
+                users.update(json.load(f))
+        
+        shards = [{} for _ in range(self.num_shards)]
+        for username, record in users.items():
+            shards[self._shard_index(username)][username] = record
+        
+        for index, shard in enumerate(shards):
+            self._save_shard(index, shard)
+        self._save_meta()
+        
+        # Remove shard files that are no longer part of the layout; a
+        # single-file database is left in place as a backup
+        if stored_shards > 1:
+            for path in set(old_paths) - set(self.shard_paths):
+                os.remove(path)
+    
+    def _shard_index(self, username: str) -> int:
+        """
+        Route a username to its shard
+        
+        Uses a stable digest rather than hash(), which is salted per process.
+        
+        Args:
+            username (str): Username
+        
+        Returns:
+            int: Index of the shard holding the user
+        """
+        if self.num_shards == 1:
+            return 0
+        digest = hashlib.md5(username.encode()).digest()
+        return int.from_bytes(digest[:4], 'big') % self.num_shards
+    
+    def _load_shard(self, index: int) -> Dict:
+        """Read all users stored in a shard"""
+        with open(self.shard_paths[index], 'r') as f:
+            return json.load(f)
+    
+    def _save_shard(self, index: int, users: Dict) -> None:
+        """
+        Atomically replace a shard file
         
-        # Create database file if it doesn't exist
-        if not os.path.exists(self.database_path):
-            with open(self.database_path, 'w') as f:
-                json.dump({}, f)
+        Writing to a temporary file and renaming it means concurrent readers
+        always see either the old or the new contents, never a partial file.
+        """
+        path = self.shard_paths[index]
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(users, f, indent=4)
+        os.replace(tmp_path, path)
     
     def _hash_password(self, password: str) -> str:
         """
@@ -41,26 +273,27 @@ class AuthenticationManager:
         Returns:
             bool: True if registration successful, False if username exists
         """
-        # Load existing users
-        with open(self.database_path, 'r') as f:
-            users = json.load(f)
-        
-        # Check if username already exists
-        if username in users:
-            return False
-        
-        # Create user entry with hashed password and initial stats
-        users[username] = {
-            'password': self._hash_password(password),
-            'total_games': 0,
-            'wins': 0,
-            'losses': 0,
-            'rank': 1000  # Starting rank
-        }
+        index = self._shard_index(username)
         
-        # Save updated users
-        with open(self.database_path, 'w') as f:
-            json.dump(users, f, indent=4)
+        with self.shard_locks[index]:
+            # Load existing users
+            users = self._load_shard(index)
+            
+            # Check if username already exists
+            if username in users:
+                return False
+            
+            # Create user entry with hashed password and initial stats
+            users[username] = {
+                'password': self._hash_password(password),
+                'total_games': 0,
+                'wins': 0,
+                'losses': 0,
+                'rank': 1000  # Starting rank
+            }
+            
+            # Save updated users
+            self._save_shard(index, users)
         
         return True
     
@@ -76,8 +309,7 @@ class AuthenticationManager:
             bool: True if authentication successful, False otherwise
         """
         # Load existing users
-        with open(self.database_path, 'r') as f:
-            users = json.load(f)
+        users = self._load_shard(self._shard_index(username))
         
         # Check if user exists and password matches
         if username not in users:
@@ -94,27 +326,30 @@ class AuthenticationManager:
             username (str): Username
             won (bool): Whether the user won the game
         """
-        # Load existing users
-        with open(self.database_path, 'r') as f:
-            users = json.load(f)
-        
-        if username not in users:
-            return
+        index = self._shard_index(username)
         
-        # Update statistics
-        users[username]['total_games'] += 1
-        if won:
-            users[username]['wins'] += 1
-            # Simple ranking increase
-            users[username]['rank'] += 20
-        else:
-            users[username]['losses'] += 1
-            # Prevent rank from going below 1000
-            users[username]['rank'] = max(1000, users[username]['rank'] - 10)
-        
-        # Save updated users
-        with open(self.database_path, 'w') as f:
-            json.dump(users, f, indent=4)
+        # Hold the shard lock across read-modify-write so concurrent
+        # games do not overwrite each other's updates
+        with self.shard_locks[index]:
+            # Load existing users
+            users = self._load_shard(index)
+            
+            if username not in users:
+                return
+            
+            # Update statistics
+            users[username]['total_games'] += 1
+            if won:
+                users[username]['wins'] += 1
+                # Simple ranking increase
+                users[username]['rank'] += 20
+            else:
+                users[username]['losses'] += 1
+                # Prevent rank from going below 1000
+                users[username]['rank'] = max(1000, users[username]['rank'] - 10)
+            
+            # Save updated users
+            self._save_shard(index, users)
     
     def get_user_stats(self, username: str) -> Optional[Dict]:
         """
@@ -126,7 +361,65 @@ class AuthenticationManager:
         Returns:
             Optional[Dict]: User statistics or None if user not found
         """
-        with open(self.database_path, 'r') as f:
-            users = json.load(f)
+        users = self._load_shard(self._shard_index(username))
+        
+        return users.get(username)
+    
+    def record_match(self, player1: str, player2: str, score1: int, score2: int) -> None:
+        """
+        Append a finished series to the match history
+        
+        Args:
+            player1 (str): First player's username
+            player2 (str): Second player's username
+            score1 (int): Rounds won by the first player
+            score2 (int): Rounds won by the second player
+        """
+        match = {
+            'timestamp': time.time(),
+            'player1': player1,
+            'player2': player2,
+            'score1': score1,
+            'score2': score2
+        }
+        
+        with self.matches_lock:
+            with open(self.matches_path, 'a') as f:
+                f.write(json.dumps(match) + '\n')
+    
+    def iter_user_stats(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream every user's statistics without credentials
+        
+        Shards are decoded one user at a time, so memory use does not grow
+        with the number of users. Each shard is read from the file that was
+        current when it was opened; updates that replace it afterwards are
+        not seen.
+        
+        Yields:
+            Tuple[str, Dict]: Username and its stats
+        """
+        for path in self.shard_paths:
+            with open(path, 'r') as f:
+                for username, record in _iter_json_object(f):
+                    yield username, {
+                        'total_games': record['total_games'],
+                        'wins': record['wins'],
+                        'losses': record['losses'],
+                        'rank': record['rank']
+                    }
+    
+    def iter_matches(self) -> Iterator[Dict]:
+        """
+        Stream the match history one record at a time
+        
+        Yields:
+            Dict: A finished series as stored by record_match
+        """
+        if not os.path.exists(self.matches_path):
+            return
         
-        return users.get(username)
\ No newline at end of file
+        with open(self.matches_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
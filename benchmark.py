@@ -0,0 +1,260 @@
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from auth import AuthenticationManager
+from stats_export import MATCH_COLUMNS, USER_COLUMNS, query_stats, write_manifest, write_table
+
+def bench_shards(args):
+    """
+    Measure stat-update throughput of the user store for several shard counts
+    
+    Each shard count is run once with a single writer and once with
+    ``--threads`` writers. Smaller shard files are cheaper to rewrite, which
+    is where the speedup comes from; the scaling column compares the two
+    runs and stays close to 1x because the JSON work holds the GIL.
+    """
+    print(f"{args.users} users, {args.threads} writer threads, {args.updates} updates per thread")
+    print(f"{'shards':>8} {'1 thread/s':>11} {f'{args.threads} threads/s':>13} {'speedup':>9} {'scaling':>9}")
+    
+    def run(auth_manager, usernames, num_threads):
+        def writer(seed):
+            rng = random.Random(seed)
+            for _ in range(args.updates):
+                auth_manager.update_user_stats(rng.choice(usernames), rng.random() < 0.5)
+        
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(num_threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return num_threads * args.updates / (time.perf_counter() - start)
+    
+    baseline = None
+    for num_shards in args.shards:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            auth_manager = AuthenticationManager(os.path.join(tmp_dir, 'users.json'), num_shards=num_shards)
+            usernames = [f"player{i}" for i in range(args.users)]
+            for username in usernames:
+                auth_manager.register_user(username, 'password')
+            
+            single = run(auth_manager, usernames, 1)
+            threaded = run(auth_manager, usernames, args.threads)
+            
+            # Every update must have been applied exactly once
+            total_games = sum(auth_manager.get_user_stats(u)['total_games'] for u in usernames)
+            assert total_games == (1 + args.threads) * args.updates, "lost stat updates"
+        
+        baseline = baseline or threaded
+        print(f"{num_shards:>8} {single:>11.0f} {threaded:>13.0f} {threaded / baseline:>8.2f}x {threaded / single:>8.2f}x")
+
+def bench_analytics(args):
+    """Time the columnar writer and query tool over synthetic rows"""
+    rng = random.Random(0)
+    
+    def synthetic_users():
+        for i in range(args.rows):
+            wins = rng.randrange(200)
+            losses = rng.randrange(200)
+            yield (f"player{i}", wins + losses, wins, losses, 1000 + 10 * rng.randrange(200))
+    
+    def synthetic_matches():
+        for i in range(args.rows):
+            yield (1.7e9 + i, f"player{i}", f"player{i + 1}", rng.randrange(3), rng.randrange(3))
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        tables = {
+            'users': write_table(os.path.join(tmp_dir, 'users'), USER_COLUMNS, synthetic_users(), 65536),
+            'matches': write_table(os.path.join(tmp_dir, 'matches'), MATCH_COLUMNS, synthetic_matches(), 65536)
+        }
+        write_manifest(tmp_dir, tables)
+        export_time = time.perf_counter() - start
+        
+        size = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(tmp_dir) for name in names
+        )
+        
+        start = time.perf_counter()
+        result = query_stats(tmp_dir)
+        query_time = time.perf_counter() - start
+    
+    print(f"{args.rows} users + {args.rows} matches")
+    print(f"export: {export_time:.2f}s, {size / 1e6:.1f} MB on disk")
+    print(f"query:  {query_time:.2f}s (mean win rate {result['mean_win_rate']:.3f})")
+
+def bench_startup(args):
+    """Measure module import cost with -X importtime and process start time"""
+    print(f"{'module':>8} {'import ms':>10} {'process ms':>11}")
+    for module in args.modules:
+        import_times = []
+        process_times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                capture_output=True, text=True, check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__))
+            )
+            process_times.append(time.perf_counter() - start)
+            
+            # Lines look like "import time: self [us] | cumulative | name"
+            for line in result.stderr.splitlines():
+                fields = line.split('|')
+                if len(fields) == 3 and fields[2].strip() == module:
+                    import_times.append(int(fields[1]) / 1000)
+        
+        print(f"{module:>8} {min(import_times):>10.1f} {min(process_times) * 1000:>11.1f}")
+
+class CountingSocket:
+    """Socket proxy counting the send and receive calls made through it"""
+    
+    def __init__(self, sock, counts):
+        self.sock = sock
+        self.counts = counts
+    
+    def fileno(self):
+        return self.sock.fileno()
+    
+    def send(self, data):
+        self.counts['send'] += 1
+        return self.sock.send(data)
+    
+    def sendmsg(self, buffers):
+        self.counts['send'] += 1
+        return self.sock.sendmsg(buffers)
+    
+    def recv(self, size):
+        self.counts['recv'] += 1
+        return self.sock.recv(size)
+    
+    def recv_into(self, buffer):
+        self.counts['recv'] += 1
+        return self.sock.recv_into(buffer)
+    
+    def close(self):
+        self.sock.close()
+
+def bench_netio(args):
+    """Count send syscalls per round with per-message sends versus buffered output"""
+    from netbuf import OutputBuffer
+    from server import GameRules, GameSession
+    
+    # One round's messages for one player, as the session emits them
+    messages = [
+        "\n--- Round 1 ---\n",
+        "player1, choose your move:\n1. Rock\n2. Paper\n3. Scissors\nEnter your choice (1/2/3): ",
+        "Invalid move. Please choose 1, 2, or 3.\n",
+        "player1, choose your move:\n1. Rock\n2. Paper\n3. Scissors\nEnter your choice (1/2/3): ",
+        "Round 1 - You won! Rock beats Scissors\nCurrent Score - player1: 1, player2: 0\n"
+    ]
+    
+    server_end, client_end = socket.socketpair()
+    drain = threading.Thread(target=lambda: [None for _ in iter(lambda: client_end.recv(65536), b'')])
+    drain.start()
+    
+    counts = {'send': 0, 'recv': 0}
+    sock = CountingSocket(server_end, counts)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for message in messages:
+            sock.send(message.encode())
+    legacy_time = time.perf_counter() - start
+    legacy_sends = counts['send']
+    
+    counts['send'] = 0
+    output = OutputBuffer(sock)
+    encoded = [message.encode() for message in messages]
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        # Header and prompt go out together, then the retry prompt, then the
+        # result is held until the next round's prompt
+        output.write(*encoded[:2])
+        output.flush()
+        output.write(*encoded[2:4])
+        output.flush()
+        output.write(encoded[4])
+    output.flush()
+    buffered_time = time.perf_counter() - start
+    buffered_sends = counts['send']
+    
+    server_end.close()
+    drain.join()
+    client_end.close()
+    
+    print(f"{args.rounds} rounds, {len(messages)} messages per round")
+    print(f"per-message send: {legacy_sends / args.rounds:.2f} sends/round, {legacy_time * 1e6 / args.rounds:.1f} us/round")
+    print(f"buffered sendmsg: {buffered_sends / args.rounds:.2f} sends/round, {buffered_time * 1e6 / args.rounds:.1f} us/round")
+    
+    # Full session of tied rounds against two bots
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auth_manager = AuthenticationManager(os.path.join(tmp_dir, 'users.json'))
+        counts = {'send': 0, 'recv': 0}
+        pairs = [socket.socketpair() for _ in range(2)]
+        
+        def bot(sock):
+            buffered = b''
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                buffered += data
+                while b'(1/2/3): ' in buffered:
+                    buffered = buffered.split(b'(1/2/3): ', 1)[1]
+                    sock.send(b'1')
+        
+        bots = [threading.Thread(target=bot, args=(pair[1],)) for pair in pairs]
+        for thread in bots:
+            thread.start()
+        
+        session = GameSession(
+            (CountingSocket(pairs[0][0], counts), 'player1'),
+            (CountingSocket(pairs[1][0], counts), 'player2'),
+            auth_manager, GameRules(best_of=args.session_rounds)
+        )
+        session.play_game()
+        for thread in bots:
+            thread.join()
+        for pair in pairs:
+            pair[1].close()
+    
+    rounds = session.round * 2
+    print(f"GameSession: {counts['send'] / rounds:.2f} sends and {counts['recv'] / rounds:.2f} recvs per player-round")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rock Paper Scissors server benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    shards_parser = subparsers.add_parser('shards', help="user store write throughput by shard count")
+    shards_parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    shards_parser.add_argument('--users', type=int, default=2000)
+    shards_parser.add_argument('--threads', type=int, default=8)
+    shards_parser.add_argument('--updates', type=int, default=200)
+    shards_parser.set_defaults(func=bench_shards)
+    
+    analytics_parser = subparsers.add_parser('analytics', help="columnar export and query time")
+    analytics_parser.add_argument('--rows', type=int, default=1000000)
+    analytics_parser.set_defaults(func=bench_analytics)
+    
+    startup_parser = subparsers.add_parser('startup', help="import time and process start cost")
+    startup_parser.add_argument('--modules', nargs='+', default=['server', 'client'])
+    startup_parser.add_argument('--runs', type=int, default=5)
+    startup_parser.set_defaults(func=bench_startup)
+    
+    netio_parser = subparsers.add_parser('netio', help="send syscalls per round")
+    netio_parser.add_argument('--rounds', type=int, default=20000)
+    netio_parser.add_argument('--session-rounds', type=int, default=101)
+    netio_parser.set_defaults(func=bench_netio)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ import socket
 import sys
 import threading
 import time
-from auth import AuthenticationManager 
 
 class RockPaperScissorsClient:
     def __init__(self, host='localhost', port=12345):
@@ -89,6 +88,7 @@ class RockPaperScissorsClient:
             
             # Authentication process
             authenticated = False
+            resumed = False
             while not authenticated:
                 try:
                     # Receive authentication prompt
@@ -124,6 +124,8 @@ class RockPaperScissorsClient:
                     # Check authentication status
                     if "successful" in auth_response.lower():
                         authenticated = True
+                        # The server put us back into a game we dropped out of
+                        resumed = "reconnected" in auth_response.lower()
                         break
                 except Exception as e:
                     print(f"Authentication error: {e}")
@@ -132,8 +134,8 @@ class RockPaperScissorsClient:
                     if retry != 'y':
                         return
             
-            # Game Mode Selection
-            while True:
+            # Game Mode Selection, skipped when resuming a game
+            while not resumed:
                 # Prompt for game mode
                 print("\nChoose Game Mode:")
                 print("1. Normal Game")
@@ -0,0 +1,121 @@
+import os
+import socket
+
+# Upper bound on fragments passed to a single sendmsg call
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+class OutputBuffer:
+    def __init__(self, sock: socket.socket):
+        """
+        Per-connection output buffer
+        
+        Fragments are kept as memoryviews of already-encoded bytes and written
+        with one scatter-gather sendmsg call per flush instead of one send per
+        message. Partial writes are handled by slicing the views, so no
+        fragment is ever copied or re-encoded.
+        
+        Args:
+            sock (socket.socket): Connected socket to flush to
+        """
+        self.sock = sock
+        self.fragments = []
+        self.pending_bytes = 0
+        self.use_sendmsg = hasattr(sock, 'sendmsg')
+    
+    def write(self, *fragments) -> None:
+        """
+        Queue pre-encoded fragments
+        
+        Args:
+            *fragments (bytes): Encoded fragments, written in order
+        """
+        for fragment in fragments:
+            if fragment:
+                self.fragments.append(memoryview(fragment))
+                self.pending_bytes += len(fragment)
+    
+    def write_message(self, message: str) -> None:
+        """
+        Encode and queue a message as one newline-terminated line
+        
+        Messages are coalesced into a single write, so the terminator is what
+        keeps consecutive messages apart on the client side.
+        
+        Args:
+            message (str): Message text, without the trailing newline
+        """
+        self.write(f"{message}\n".encode())
+    
+    def flush(self) -> int:
+        """
+        Write every queued fragment to the socket
+        
+        Raises OSError if the peer has gone away; the queue is dropped in
+        that case since it can never be delivered.
+        
+        Returns:
+            int: Number of bytes written
+        """
+        written = 0
+        try:
+            while self.fragments:
+                if self.use_sendmsg:
+                    sent = self.sock.sendmsg(self.fragments[:IOV_MAX])
+                else:
+                    sent = self.sock.send(b''.join(self.fragments))
+                written += sent
+                self._advance(sent)
+        except OSError:
+            self.clear()
+            raise
+        return written
+    
+    def _advance(self, sent: int) -> None:
+        """Drop fully written fragments and slice a partially written one"""
+        self.pending_bytes -= sent
+        index = 0
+        while sent and index < len(self.fragments):
+            size = len(self.fragments[index])
+            if sent < size:
+                self.fragments[index] = self.fragments[index][sent:]
+                break
+            sent -= size
+            index += 1
+        del self.fragments[:index]
+    
+    def clear(self) -> None:
+        """Discard queued fragments"""
+        self.fragments.clear()
+        self.pending_bytes = 0
+
+class InputBuffer:
+    def __init__(self, size: int = 1024):
+        """
+        Reusable receive buffer
+        
+        Data is read with recv_into into one preallocated bytearray, so
+        receiving a message does not allocate a new bytes object.
+        
+        Args:
+            size (int): Maximum bytes read per call
+        """
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+    
+    def recv_from(self, sock: socket.socket) -> memoryview:
+        """
+        Receive once from a socket
+        
+        The returned view is only valid until the next call.
+        
+        Args:
+            sock (socket.socket): Socket to read from
+        
+        Returns:
+            memoryview: Received bytes; empty if the peer closed the connection
+        """
+        count = sock.recv_into(self.buffer)
+        return self.view[:count]
@@ -0,0 +1,258 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+    
+    def __init__(self, rate: float, capacity: float, now: float):
+        """
+        Initialize a full token bucket
+        
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum number of tokens the bucket can hold
+            now (float): Current monotonic time
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+    
+    def refill(self, now: float) -> float:
+        """
+        Add the tokens accrued since the last update
+        
+        Args:
+            now (float): Current monotonic time
+        
+        Returns:
+            float: Tokens now in the bucket
+        """
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+        return self.tokens
+    
+    def consume(self, now: float, tokens: float = 1) -> bool:
+        """
+        Refill the bucket and try to take tokens from it
+        
+        Args:
+            now (float): Current monotonic time
+            tokens (float): Number of tokens to take
+        
+        Returns:
+            bool: True if enough tokens were available, False otherwise
+        """
+        if self.refill(now) >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+class BucketMap:
+    def __init__(self, rate: float, capacity: float, max_entries: int = 10000):
+        """
+        Bounded map of token buckets keyed by client identity
+        
+        Entries are kept in least-recently-used order. A bucket that has been
+        idle long enough to refill completely behaves exactly like a new one,
+        so it is dropped, and the oldest entry is evicted once the map is full.
+        
+        Args:
+            rate (float): Tokens added per second for each bucket
+            capacity (float): Burst size of each bucket
+            max_entries (int): Maximum number of buckets kept in memory
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.max_entries = max_entries
+        self.idle_ttl = capacity / rate if rate > 0 else float('inf')
+        self.buckets = OrderedDict()
+        self.evictions = 0
+    
+    def consume(self, key: Hashable, now: float) -> bool:
+        """
+        Take one token from the bucket for the given key
+        
+        Args:
+            key (Hashable): Client identity (IP address, username or both)
+            now (float): Current monotonic time
+        
+        Returns:
+            bool: True if the request is within the limit
+        """
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = TokenBucket(self.rate, self.capacity, now)
+            self.buckets[key] = bucket
+        else:
+            self.buckets.move_to_end(key)
+        
+        return bucket.consume(now)
+    
+    def has_tokens(self, key: Hashable, now: float) -> bool:
+        """
+        Check whether the bucket for the given key has a token left, without
+        taking it; keys without a bucket are never limited
+        
+        Args:
+            key (Hashable): Client identity
+            now (float): Current monotonic time
+        
+        Returns:
+            bool: True if a request would be within the limit
+        """
+        bucket = self.buckets.get(key)
+        return bucket is None or bucket.refill(now) >= 1
+    
+    def _evict(self, now: float) -> None:
+        """Drop idle buckets from the old end and enforce the size bound"""
+        while self.buckets:
+            oldest_key, oldest = next(iter(self.buckets.items()))
+            if now - oldest.updated < self.idle_ttl and len(self.buckets) < self.max_entries:
+                break
+            del self.buckets[oldest_key]
+            self.evictions += 1
+    
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+class AdmissionController:
+    def __init__(self, connection_rate=1.0, connection_burst=10,
+                 auth_rate=0.5, auth_burst=10,
+                 ip_username_rate=0.2, ip_username_burst=5,
+                 failed_login_rate=0.1, failed_login_burst=20,
+                 max_entries=10000):
+        """
+        Admission layer in front of connection handling and authentication
+        
+        Every check is done in memory, so over-limit clients are rejected
+        before any thread is spawned or the user database is touched.
+        
+        Args:
+            connection_rate (float): New connections per second allowed per IP
+            connection_burst (int): Connection burst allowed per IP
+            auth_rate (float): LOGIN/REGISTER attempts per second allowed per IP
+            auth_burst (int): Authentication burst allowed per IP
+            ip_username_rate (float): Attempts per second allowed per username from one IP
+            ip_username_burst (int): Authentication burst allowed per username from one IP
+            failed_login_rate (float): Failed LOGINs per second allowed per username
+                across all IPs
+            failed_login_burst (int): Failed LOGIN burst allowed per username
+            max_entries (int): Maximum number of buckets kept for each map
+        """
+        self.lock = threading.Lock()
+        self.connection_buckets = BucketMap(connection_rate, connection_burst, max_entries)
+        self.auth_buckets = BucketMap(auth_rate, auth_burst, max_entries)
+        self.ip_username_buckets = BucketMap(ip_username_rate, ip_username_burst, max_entries)
+        self.username_buckets = BucketMap(failed_login_rate, failed_login_burst, max_entries)
+        
+        # Rejection counters
+        self.counters = {
+            'connections_rejected': 0,
+            'auth_rejected_ip': 0,
+            'auth_rejected_ip_username': 0,
+            'auth_rejected_username': 0,
+            'failed_logins': 0
+        }
+    
+    def admit_connection(self, ip: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a new connection from this IP may be accepted
+        
+        Args:
+            ip (str): Remote IP address
+            now (Optional[float]): Current monotonic time, defaults to time.monotonic()
+        
+        Returns:
+            bool: True if the connection is admitted
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        with self.lock:
+            if self.connection_buckets.consume(ip, now):
+                return True
+            self.counters['connections_rejected'] += 1
+            return False
+    
+    def admit_auth(self, ip: str, username: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """
+        Check whether an authentication attempt may reach the user database
+        
+        Besides the per-IP limit, attempts on one username are limited per
+        (IP, username) pair, and a username is refused from every address
+        once its failed LOGINs (see record_failed_login) exceed the
+        per-username limit. Only failures are charged to the username, so a
+        client that keeps to its own limits cannot lock an account out, but
+        guessing one password from many addresses is still throttled.
+        
+        Args:
+            ip (str): Remote IP address
+            username (Optional[str]): Username the attempt is for, if parsed
+            now (Optional[float]): Current monotonic time, defaults to time.monotonic()
+        
+        Returns:
+            bool: True if the attempt is admitted
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        with self.lock:
+            if not self.auth_buckets.consume(ip, now):
+                self.counters['auth_rejected_ip'] += 1
+                return False
+            
+            if username is None:
+                return True
+            
+            if not self.username_buckets.has_tokens(username, now):
+                self.counters['auth_rejected_username'] += 1
+                return False
+            
+            if not self.ip_username_buckets.consume((ip, username), now):
+                self.counters['auth_rejected_ip_username'] += 1
+                return False
+            
+            return True
+    
+    def record_failed_login(self, username: str, now: Optional[float] = None) -> None:
+        """
+        Charge a failed LOGIN to the username's bucket
+        
+        Args:
+            username (str): Username the failed attempt was for
+            now (Optional[float]): Current monotonic time, defaults to time.monotonic()
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        with self.lock:
+            self.counters['failed_logins'] += 1
+            self.username_buckets.consume(username, now)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retrieve rejection counters and bucket map sizes
+        
+        Returns:
+            Dict[str, int]: Snapshot of admission statistics
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            stats['tracked_ips'] = len(
+                self.connection_buckets.buckets.keys() | self.auth_buckets.buckets.keys()
+            )
+            stats['tracked_ip_usernames'] = len(self.ip_username_buckets)
+            stats['tracked_usernames'] = len(self.username_buckets)
+            stats['evictions'] = (
+                self.connection_buckets.evictions
+                + self.auth_buckets.evictions
+                + self.ip_username_buckets.evictions
+                + self.username_buckets.evictions
+            )
+            return stats
@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+class Deadline:
+    __slots__ = ('when', 'seq', 'callback', 'cancelled')
+    
+    def __init__(self, when: float, seq: int, callback: Callable[[], None]):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.cancelled = False
+    
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+class DeadlineScheduler:
+    def __init__(self):
+        """
+        Single background thread servicing the deadlines of every session
+        
+        Deadlines live in a min-heap ordered by expiry time. Cancelling only
+        flags the entry; flagged entries are skipped when they reach the top
+        and the heap is compacted once they make up most of it.
+        """
+        self.heap = []
+        self.condition = threading.Condition()
+        self.counter = itertools.count()
+        self.cancelled_count = 0
+        self.thread = None
+        self.is_running = False
+    
+    def start(self) -> None:
+        """Start the scheduler thread if it is not already running"""
+        with self.condition:
+            if self.is_running:
+                return
+            self.is_running = True
+            self.thread = threading.Thread(target=self._run, name='deadline-scheduler', daemon=True)
+            self.thread.start()
+    
+    def stop(self) -> None:
+        """Stop the scheduler thread, dropping pending deadlines"""
+        with self.condition:
+            self.is_running = False
+            self.heap.clear()
+            self.cancelled_count = 0
+            self.condition.notify()
+    
+    def schedule(self, delay: float, callback: Callable[[], None]) -> Deadline:
+        """
+        Run a callback once after a delay
+        
+        Callbacks run on the scheduler thread and must return quickly.
+        
+        Args:
+            delay (float): Seconds from now until the deadline
+            callback (Callable[[], None]): Function called when it expires
+        
+        Returns:
+            Deadline: Handle that can be passed to cancel()
+        """
+        deadline = Deadline(time.monotonic() + delay, next(self.counter), callback)
+        with self.condition:
+            heapq.heappush(self.heap, deadline)
+            # Only wake the thread if the earliest deadline changed
+            if self.heap[0] is deadline:
+                self.condition.notify()
+        return deadline
+    
+    def cancel(self, deadline: Deadline) -> None:
+        """
+        Cancel a pending deadline; cancelling an expired one is a no-op
+        
+        Args:
+            deadline (Deadline): Handle returned by schedule()
+        """
+        with self.condition:
+            if deadline.cancelled:
+                return
+            deadline.cancelled = True
+            self.cancelled_count += 1
+            
+            if self.cancelled_count > 64 and self.cancelled_count * 2 > len(self.heap):
+                self.heap = [d for d in self.heap if not d.cancelled]
+                heapq.heapify(self.heap)
+                self.cancelled_count = 0
+    
+    def pending(self) -> int:
+        """Number of deadlines that have neither expired nor been cancelled"""
+        with self.condition:
+            return len(self.heap) - self.cancelled_count
+    
+    def _run(self) -> None:
+        """Sleep until the earliest deadline, then fire every expired one"""
+        while True:
+            with self.condition:
+                if not self.is_running:
+                    return
+                
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                
+                delay = self.heap[0].when - time.monotonic()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                
+                deadline = heapq.heappop(self.heap)
+                if deadline.cancelled:
+                    self.cancelled_count -= 1
+                    continue
+                # Mark as done so a late cancel() does not skew the count
+                deadline.cancelled = True
+            
+            try:
+                deadline.callback()
+            except Exception as e:
+                print(f"Error in deadline callback: {e}")
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> DeadlineScheduler:
+    """Return the process-wide scheduler, starting it on first use"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = DeadlineScheduler()
+            _default_scheduler.start()
+        return _default_scheduler
@@ -1,24 +1,328 @@
+import itertools
+import selectors
 import socket
 import threading
 import time
 import math
 import random
 import queue
-from auth import AuthenticationManager 
+from netbuf import InputBuffer, OutputBuffer
+
+# Optional subsystems (auth backend, rate limiting, tournament) are imported
+# or constructed on first use so that short-lived processes importing this
+# module do not pay for them
+
+# Fixed protocol fragments, encoded once
+INVALID_MOVE_MSG = b"Invalid move. Please choose 1, 2, or 3.\n"
+MOVE_CHOICES_MSG = (
+    b"1. Rock\n"
+    b"2. Paper\n"
+    b"3. Scissors\n"
+    b"Enter your choice (1/2/3): "
+)
+RECONNECT_MSG = b"Login successful! Reconnected to your game in progress.\n"
+
+class GameRules:
+    def __init__(self, best_of=3, move_timeout=30, series_timeout=None, forfeit_on_timeout=False,
+                 reconnect_grace=30):
+        """
+        Rules for a game series
+        
+        Args:
+            best_of (int): Maximum number of rounds, must be odd
+            move_timeout (float): Seconds each player has to choose a move
+            series_timeout (Optional[float]): Seconds the whole series may last, None for no limit
+            forfeit_on_timeout (bool): Whether missing a move deadline forfeits the series
+                rather than just the round
+            reconnect_grace (float): Seconds a disconnected player has to log in again
+                and resume the series before forfeiting it, 0 to forfeit at once
+        """
+        if best_of < 1 or best_of % 2 == 0:
+            raise ValueError("best_of must be a positive odd number")
+        if move_timeout <= 0 or (series_timeout is not None and series_timeout <= 0):
+            raise ValueError("timeouts must be positive")
+        if reconnect_grace < 0:
+            raise ValueError("reconnect_grace cannot be negative")
+        
+        self.best_of = best_of
+        self.wins_needed = best_of // 2 + 1
+        self.move_timeout = move_timeout
+        self.series_timeout = series_timeout
+        self.forfeit_on_timeout = forfeit_on_timeout
+        self.reconnect_grace = reconnect_grace
+
+class SessionRegistry:
+    def __init__(self):
+        """Active game sessions keyed by session id, with the seat of every player"""
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.seats = {}
+        self.ids = itertools.count(1)
+
+    def register(self, session):
+        """Track a session and its players, returning its session id"""
+        with self.lock:
+            session_id = next(self.ids)
+            self.sessions[session_id] = session
+            for username in session.usernames:
+                self.seats[username] = session_id
+            return session_id
+
+    def unregister(self, session):
+        """Forget a finished session"""
+        with self.lock:
+            self.sessions.pop(session.session_id, None)
+            for username in session.usernames:
+                if self.seats.get(username) == session.session_id:
+                    del self.seats[username]
+
+    def reattach(self, username, client_socket):
+        """
+        Give a re-authenticated player back their seat in a game in progress
+        
+        Returns:
+            bool: True if the player had a vacant seat and now owns the socket
+        """
+        with self.lock:
+            session = self.sessions.get(self.seats.get(username))
+        return session is not None and session.reattach(username, client_socket)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.sessions)
 
 class GameSession:
-    def __init__(self, player1_info, player2_info):
+    def __init__(self, player1_info, player2_info, auth_manager=None, rules=None, scheduler=None,
+                 registry=None):
         self.players = [player1_info[0], player2_info[0]]  # Socket
         self.usernames = [player1_info[1], player2_info[1]]  # Username
-        self.auth_manager = AuthenticationManager()
+        if auth_manager is None:
+            from auth import AuthenticationManager
+            auth_manager = AuthenticationManager()
+        self.auth_manager = auth_manager
         self.moves = {}
         self.scores = {self.usernames[0]: 0, self.usernames[1]: 0}
         self.round = 0
-        self.MAX_ROUNDS = 3
+        self.rules = rules or GameRules()
         self.game_over = False
 
+        # Move and series deadlines are serviced by one shared scheduler
+        # thread instead of per-socket timeouts in every session
+        if scheduler is None:
+            from scheduler import get_scheduler
+            scheduler = get_scheduler()
+        self.scheduler = scheduler
+        self.series_expired = False
+        
+        # Every move deadline carries its own token, so a callback from an
+        # earlier round that fires after being popped cannot end a later one
+        self.move_tokens = itertools.count(1)
+        self.move_token = None
+        self.expired_move_token = None
+        
+        # The scheduler wakes a waiting session by writing to this pair
+        self.wakeup_recv, self.wakeup_send = socket.socketpair()
+        self.wakeup_recv.setblocking(False)
+        self.wakeup_send.setblocking(False)
+        
+        # Player indexes that disconnected or forfeited the series
+        self.disconnected = set()
+        self.forfeited = set()
+
+        # Seat state shared with handler threads re-attaching players and
+        # with the scheduler expiring grace windows
+        self.seat_lock = threading.Lock()
+        self.grace_deadlines = {}
+        self.abandoned = set()
+        self.reattached = []
+        # Connections replaced by a re-login, closed by the session thread
+        # once it no longer waits on them
+        self.stale_sockets = []
+        self.finished = False
+
+        # Outgoing messages are queued per player and flushed with one
+        # sendmsg call right before the session waits for input
+        self.outputs = [OutputBuffer(player) for player in self.players]
+        self.input_buffer = InputBuffer()
+        self.move_prompts = [
+            f"{username}, choose your move:\n".encode() for username in self.usernames
+        ]
+        
+        self.registry = registry
+        self.session_id = registry.register(self) if registry is not None else None
+
+    def _send(self, index, message):
+        """Queue a message for one player as a newline-terminated line"""
+        if index not in self.disconnected:
+            self.outputs[index].write_message(message)
+
+    def _broadcast(self, message):
+        """Queue a message line for both players, encoding it once"""
+        data = f"{message}\n".encode()
+        for i, output in enumerate(self.outputs):
+            if i not in self.disconnected:
+                output.write(data)
+
+    def _flush(self, index):
+        """Deliver one player's queued messages, reporting whether they were sent"""
+        if index in self.disconnected:
+            return False
+        output = self.outputs[index]
+        try:
+            output.flush()
+            return True
+        except OSError as e:
+            print(f"Could not send to {self.usernames[index]}: {e}")
+            self._drop_player(index, output.sock)
+            return False
+
+    def _flush_all(self):
+        """Deliver every player's queued messages"""
+        for i in range(len(self.players)):
+            self._flush(i)
+
+    def _score_line(self, index, label="Current Score"):
+        """Score from one player's point of view"""
+        me, opponent = self.usernames[index], self.usernames[1 - index]
+        return f"{label} - {me}: {self.scores[me]}, {opponent}: {self.scores[opponent]}"
+
+    def _wake(self):
+        """Interrupt the session's wait for moves"""
+        try:
+            self.wakeup_send.send(b'\0')
+        except OSError:
+            # Buffer full or session already closed; either way it will wake
+            pass
+
+    def _drain_wakeup(self):
+        """Discard pending wakeup bytes"""
+        try:
+            while self.wakeup_recv.recv(64):
+                pass
+        except OSError:
+            pass
+
+    def _expire_move(self, token):
+        """Scheduler callback for the move deadline identified by token"""
+        self.expired_move_token = token
+        self._wake()
+
+    def _expire_series(self):
+        """Scheduler callback for the per-series deadline"""
+        self.series_expired = True
+        self._wake()
+
+    def _expire_grace(self, index):
+        """Scheduler callback ending a disconnected player's grace window"""
+        with self.seat_lock:
+            if index not in self.disconnected:
+                return
+            self.abandoned.add(index)
+            self.grace_deadlines.pop(index, None)
+        self._wake()
+
+    def _drop_player(self, index, sock=None):
+        """
+        Vacate the seat of a player whose connection was lost
+        
+        Args:
+            index (int): Seat of the player
+            sock (Optional[socket.socket]): Connection that failed; nothing is
+                done if a re-login has already given the seat a new one
+        """
+        with self.seat_lock:
+            if index in self.disconnected or (sock is not None and sock is not self.players[index]):
+                return
+            self.disconnected.add(index)
+            old_socket = self.players[index]
+            self.outputs[index].clear()
+            
+            grace = self.rules.reconnect_grace
+            if grace and not self.finished:
+                self.grace_deadlines[index] = self.scheduler.schedule(
+                    grace, lambda: self._expire_grace(index)
+                )
+            else:
+                self.abandoned.add(index)
+        
+        print(f"{self.usernames[index]} disconnected")
+        try:
+            old_socket.close()
+        except OSError:
+            pass
+        
+        if grace and index not in self.abandoned:
+            opponent = 1 - index
+            self._send(opponent, f"{self.usernames[index]} disconnected. Waiting up to {grace} seconds for them to reconnect...")
+            self._flush(opponent)
+
+    def reattach(self, username, client_socket):
+        """
+        Seat a re-authenticated player again during their grace window
+        
+        A seat that still looks connected is taken over as well: its player
+        is not watched between moves and a half-open connection is never
+        reported, so a re-login is the first sign that it has gone. Called
+        from a connection handler thread; the session thread picks the new
+        socket up, and closes a replaced one, the next time it wakes.
+        
+        Args:
+            username (str): Username that logged in again
+            client_socket (socket.socket): Its new connection
+        
+        Returns:
+            bool: True if the player was re-attached
+        """
+        index = self.usernames.index(username)
+        with self.seat_lock:
+            if self.finished or index in self.abandoned:
+                return False
+            
+            if index not in self.disconnected:
+                self.stale_sockets.append(self.players[index])
+            self.players[index] = client_socket
+            self.outputs[index] = OutputBuffer(client_socket)
+            self.outputs[index].write(RECONNECT_MSG)
+            self.disconnected.discard(index)
+            self.reattached.append(index)
+            grace_deadline = self.grace_deadlines.pop(index, None)
+        
+        if grace_deadline is not None:
+            self.scheduler.cancel(grace_deadline)
+        print(f"{username} reconnected to session {self.session_id}")
+        self._wake()
+        return True
+
+    def _take_reattached(self):
+        """Return and clear the seats re-attached since the last call"""
+        with self.seat_lock:
+            reattached, self.reattached = self.reattached, []
+        return reattached
+
+    def _close_stale_sockets(self):
+        """Close connections whose seats were taken over by a re-login"""
+        with self.seat_lock:
+            stale_sockets, self.stale_sockets = self.stale_sockets, []
+        for sock in stale_sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
     def collect_moves(self):
-        """Collect moves for a single round"""
+        """
+        Collect moves from both players for a single round
+        
+        Both players are prompted at once and the session blocks on their
+        sockets without a timeout; the scheduler wakes it when the move or
+        series deadline passes. While a seat is vacant the move deadline is
+        suspended until the player re-attaches or their grace window ends;
+        once a grace window has ended the round is abandoned at once.
+        
+        Returns:
+            list: Indexes of abandoned seats if there are any, otherwise of
+                players who did not submit a move
+        """
         self.moves.clear()
         choices = {
             '1': 'Rock', 
@@ -26,36 +330,136 @@ class GameSession:
             '3': 'Scissors'
         }
         
-        for i, player in enumerate(self.players):
-            while True:
-                try:
-                    # Send move prompt with choices using actual username
-                    move_prompt = (
-                        f"{self.usernames[i]}, choose your move:\n"
-                        "1. Rock\n"
-                        "2. Paper\n"
-                        "3. Scissors\n"
-                        "Enter your choice (1/2/3): "
+        selector = selectors.DefaultSelector()
+        selector.register(self.wakeup_recv, selectors.EVENT_READ)
+        # Players still expected to move, with the socket being waited on
+        pending = {}
+        
+        def prompt(i):
+            # Send move prompt with choices using actual username, together
+            # with everything queued since the last prompt
+            self.outputs[i].write(self.move_prompts[i], MOVE_CHOICES_MSG)
+            if self._flush(i):
+                selector.register(self.players[i], selectors.EVENT_READ, i)
+                pending[i] = self.players[i]
+        
+        def unwatch(i):
+            sock = pending.pop(i, None)
+            if sock is not None:
+                selector.unregister(sock)
+        
+        # Seats re-attached between rounds are prompted like everyone else
+        self._take_reattached()
+        self._close_stale_sockets()
+        for i in range(len(self.players)):
+            if i not in self.disconnected:
+                prompt(i)
+        
+        deadline = None
+        try:
+            while not self.series_expired:
+                for i in self._take_reattached():
+                    unwatch(i)
+                    if self.usernames[i] in self.moves:
+                        self._flush(i)
+                    else:
+                        self._send(i, f"Round {self.round}\n{self._score_line(i)}")
+                        prompt(i)
+                    self._send(1 - i, f"{self.usernames[i]} reconnected.")
+                    self._flush(1 - i)
+                self._close_stale_sockets()
+                
+                # Stop waiting on sockets that were dropped by a failed send
+                for i in pending.keys() & self.disconnected:
+                    unwatch(i)
+                
+                # An abandoned seat ends the series, so the opponent is not
+                # kept waiting for a move they could only be charged for
+                if self.abandoned:
+                    break
+                
+                vacant = self.disconnected - self.abandoned
+                if not pending and not vacant:
+                    break
+                
+                # Suspend the move deadline while waiting for a reconnect
+                if vacant and deadline is not None:
+                    self.scheduler.cancel(deadline)
+                    deadline = None
+                elif not vacant and deadline is None:
+                    self.move_token = token = next(self.move_tokens)
+                    deadline = self.scheduler.schedule(
+                        self.rules.move_timeout, lambda token=token: self._expire_move(token)
                     )
-                    player.send(move_prompt.encode())
+                
+                if deadline is not None and self.expired_move_token == self.move_token:
+                    break
+                
+                for key, _ in selector.select():
+                    if key.fileobj is self.wakeup_recv:
+                        self._drain_wakeup()
+                        continue
                     
-                    # Set timeout for move
-                    player.settimeout(30)
-                    move = player.recv(1024).decode().strip()
+                    i = key.data
+                    # A re-login replaced this connection; the new one is
+                    # picked up at the top of the loop
+                    if key.fileobj is not self.players[i]:
+                        continue
+                    
+                    try:
+                        data = self.input_buffer.recv_from(key.fileobj)
+                    except OSError as e:
+                        print(f"Error collecting move from {self.usernames[i]}: {e}")
+                        data = b''
+                    
+                    if not data:
+                        unwatch(i)
+                        self._drop_player(i, key.fileobj)
+                        continue
                     
                     # Validate move
+                    move = str(data, 'utf-8', 'replace').strip()
                     if move not in choices:
-                        player.send("Invalid move. Please choose 1, 2, or 3.".encode())
+                        self.outputs[i].write(INVALID_MOVE_MSG, self.move_prompts[i], MOVE_CHOICES_MSG)
+                        if not self._flush(i):
+                            unwatch(i)
                         continue
                     
                     self.moves[self.usernames[i]] = move
-                    break  # Valid move, exit the inner loop
-                
-                except Exception as e:
-                    print(f"Error collecting move from {self.usernames[i]}: {e}")
-                    player.send("An error occurred. Please try again.".encode())
+                    unwatch(i)
+        finally:
+            if deadline is not None:
+                self.scheduler.cancel(deadline)
+            selector.close()
         
-        return True
+        if self.abandoned:
+            return sorted(self.abandoned)
+        return sorted(i for i in range(len(self.players)) if self.usernames[i] not in self.moves)
+
+    def handle_missed_moves(self, missed):
+        """Apply the timeout rules to players who did not submit a move"""
+        for i in missed:
+            reason = "disconnected" if i in self.abandoned else "ran out of time"
+            self._broadcast(f"Round {self.round} - {self.usernames[i]} {reason}.")
+            
+            # A player whose grace window ran out cannot continue the series
+            if i in self.abandoned or self.rules.forfeit_on_timeout:
+                self.forfeited.add(i)
+        
+        if self.forfeited:
+            return
+        
+        if len(missed) == len(self.players):
+            for j in range(len(self.players)):
+                self._send(j, f"Round {self.round} - No point awarded.\n{self._score_line(j)}")
+            return
+        
+        # The player who did move takes the round
+        winner = 1 - missed[0]
+        self.scores[self.usernames[winner]] += 1
+        for j in range(len(self.players)):
+            outcome = "You won!" if j == winner else "You lost!"
+            self._send(j, f"Round {self.round} - {outcome}\n{self._score_line(j)}")
 
     def determine_round_winner(self):
         """Determine winner of a single round"""
@@ -65,8 +469,7 @@ class GameSession:
 
         if move1 == move2:
             # Tie
-            for player in self.players:
-                player.send(f"Round {self.round} Tie! Both players chose {move1_word}".encode())
+            self._broadcast(f"Round {self.round} Tie! Both players chose {move1_word}")
             return
         
         # All winning scenarios
@@ -79,88 +482,118 @@ class GameSession:
         if winning_combos[move1] == move2:
             # Player 1 wins
             self.scores[self.usernames[0]] += 1
-            self.players[0].send(
-                (f"Round {self.round} - You won! {move1_word} beats {move2_word}\n"
-                 f"Current Score - {self.usernames[0]}: {self.scores[self.usernames[0]]}, {self.usernames[1]}: {self.scores[self.usernames[1]]}").encode()
-            )
-            self.players[1].send(
-                (f"Round {self.round} - You lost! {move2_word} is beaten by {move1_word}\n"
-                 f"Current Score - {self.usernames[1]}: {self.scores[self.usernames[1]]}, {self.usernames[0]}: {self.scores[self.usernames[0]]}").encode()
-            )
+            self._send(0, f"Round {self.round} - You won! {move1_word} beats {move2_word}\n{self._score_line(0)}")
+            self._send(1, f"Round {self.round} - You lost! {move2_word} is beaten by {move1_word}\n{self._score_line(1)}")
         else:
             # Player 2 wins
             self.scores[self.usernames[1]] += 1
-            self.players[0].send(
-                (f"Round {self.round} - You lost! {move1_word} is beaten by {move2_word}\n"
-                 f"Current Score - {self.usernames[0]}: {self.scores[self.usernames[0]]}, {self.usernames[1]}: {self.scores[self.usernames[1]]}").encode()
-            )
-            self.players[1].send(
-                (f"Round {self.round} - You won! {move2_word} beats {move1_word}\n"
-                 f"Current Score - {self.usernames[1]}: {self.scores[self.usernames[1]]}, {self.usernames[0]}: {self.scores[self.usernames[0]]}").encode()
-            )
+            self._send(0, f"Round {self.round} - You lost! {move1_word} is beaten by {move2_word}\n{self._score_line(0)}")
+            self._send(1, f"Round {self.round} - You won! {move2_word} beats {move1_word}\n{self._score_line(1)}")
 
     def play_game(self):
         """Run the entire game series"""
+        series_deadline = None
         try:
             # Send initial game start message
-            game_start_msg = f"Game started! {self.usernames[0]} vs {self.usernames[1]} - Best of 3 rounds."
-            for player in self.players:
-                player.send(game_start_msg.encode())
+            game_start_msg = f"Game started! {self.usernames[0]} vs {self.usernames[1]} - Best of {self.rules.best_of} rounds."
+            self._broadcast(game_start_msg)
+
+            if self.rules.series_timeout is not None:
+                series_deadline = self.scheduler.schedule(self.rules.series_timeout, self._expire_series)
 
-            while self.round < self.MAX_ROUNDS:
+            while self.round < self.rules.best_of and not self.forfeited:
                 # Check if there's an overall winner
-                if max(self.scores.values()) >= 2:
+                if max(self.scores.values()) >= self.rules.wins_needed:
                     break
                 
                 self.round += 1
                 print(f"Starting Round {self.round}")
                 
                 # Send round start message
-                round_start_msg = f"\n--- Round {self.round} ---\n"
-                for player in self.players:
-                    player.send(round_start_msg.encode())
+                round_start_msg = f"\n--- Round {self.round} ---"
+                self._broadcast(round_start_msg)
                 
                 # Collect moves
-                if not self.collect_moves():
-                    continue
+                missed = self.collect_moves()
+                
+                if self.series_expired:
+                    self._broadcast("Series time limit reached!")
+                    break
                 
                 # Determine round winner
-                self.determine_round_winner()
+                if missed:
+                    self.handle_missed_moves(missed)
+                else:
+                    self.determine_round_winner()
             
             # Determine series winner
             self.get_series_winner()
         except Exception as e:
             print(f"Error in game session: {e}")
         finally:
+            if series_deadline is not None:
+                self.scheduler.cancel(series_deadline)
+            
+            # Deliver the final results before closing
+            self._flush_all()
+            
+            # Refuse further re-attachments and release everything the
+            # session holds so that no thread or deadline outlives it
+            with self.seat_lock:
+                self.finished = True
+                grace_deadlines = list(self.grace_deadlines.values())
+                self.grace_deadlines.clear()
+            for grace_deadline in grace_deadlines:
+                self.scheduler.cancel(grace_deadline)
+            if self.registry is not None:
+                self.registry.unregister(self)
+            
             # Close player connections
-            for player in self.players:
+            for player in self.players + self.stale_sockets + [self.wakeup_recv, self.wakeup_send]:
                 try:
                     player.close()
                 except:
                     pass
 
     def get_series_winner(self):
-        auth_manager = AuthenticationManager()
-    
-        if self.scores[self.usernames[0]] > self.scores[self.usernames[1]]:
-            self.players[0].send(f"Game Over! You won the series {self.scores[self.usernames[0]]}-{self.scores[self.usernames[1]]}".encode())
-            self.players[1].send(f"Game Over! You lost the series {self.scores[self.usernames[0]]}-{self.scores[self.usernames[1]]}".encode())
-        
-            # Update user stats
-            auth_manager.update_user_stats(self.usernames[0], True)
-            auth_manager.update_user_stats(self.usernames[1], False)
+        auth_manager = self.auth_manager
     
+        # A forfeit decides the series regardless of the score
+        if len(self.forfeited) == 1:
+            winner = 1 - next(iter(self.forfeited))
+        elif self.forfeited:
+            winner = None
+        elif self.scores[self.usernames[0]] > self.scores[self.usernames[1]]:
+            winner = 0
         elif self.scores[self.usernames[1]] > self.scores[self.usernames[0]]:
-            self.players[0].send(f"Game Over! You lost the series {self.scores[self.usernames[1]]}-{self.scores[self.usernames[0]]}".encode())
-            self.players[1].send(f"Game Over! You won the series {self.scores[self.usernames[1]]}-{self.scores[self.usernames[0]]}".encode())
+            winner = 1
+        else:
+            winner = None
+    
+        if winner is not None:
+            loser = 1 - winner
+            if self.forfeited:
+                # The round score says nothing about who won, so report it apart
+                self._send(winner, f"Game Over! You won the series by forfeit.\n{self._score_line(winner, 'Final Score')}")
+                self._send(loser, f"Game Over! You lost the series by forfeit.\n{self._score_line(loser, 'Final Score')}")
+            else:
+                score = f"{self.scores[self.usernames[winner]]}-{self.scores[self.usernames[loser]]}"
+                self._send(winner, f"Game Over! You won the series {score}")
+                self._send(loser, f"Game Over! You lost the series {score}")
         
             # Update user stats
-            auth_manager.update_user_stats(self.usernames[0], False)
-            auth_manager.update_user_stats(self.usernames[1], True)
+            auth_manager.update_user_stats(self.usernames[winner], True)
+            auth_manager.update_user_stats(self.usernames[loser], False)
     
         else:
-            for player in self.players:
-                player.send("Game Over! The series is a tie!".encode())
+            for i in range(len(self.players)):
+                self._send(i, "Game Over! The series is a tie!")
+        
+        # Keep the match history for offline analytics
+        auth_manager.record_match(
+            self.usernames[0], self.usernames[1],
+            self.scores[self.usernames[0]], self.scores[self.usernames[1]]
+        )
                 
 class Tournament:
     def __init__(self, max_players=16):
@@ -330,34 +763,74 @@ class Tournament:
         print(f"Eliminated Players: {[p[1] for p in self.eliminated_players]}")
 
 class RockPaperScissorsServer:
-    def __init__(self, host='localhost', port=12345):
+    def __init__(self, host='localhost', port=12345, num_shards=8, rules=None):
         self.host = host
         self.port = port
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind((self.host, self.port))
         
-        # Create tournament instance
-        self.tournament = Tournament()
-        
         # Queue for waiting players
         self.waiting_players = queue.Queue()
         
-        # Active game sessions
-        self.active_sessions = []
+        # Active game sessions, used to resume games after a reconnect
+        self.sessions = SessionRegistry()
+        
+        # Rules applied to every normal game session
+        self.rules = rules or GameRules()
+        
+        # Lazily created subsystems, see the properties below
+        self.num_shards = num_shards
+        self.init_lock = threading.Lock()
+        self._tournament = None
+        self._auth_manager = None
+        self._admission = None
         
         # Flag to control server
         self.is_running = True
 
-    def handle_player_connection(self, client_socket):
+    def _get_or_create(self, attr, factory):
+        """Create a subsystem once, on first access, even across threads"""
+        value = getattr(self, attr)
+        if value is None:
+            with self.init_lock:
+                value = getattr(self, attr)
+                if value is None:
+                    value = factory()
+                    setattr(self, attr, value)
+        return value
+
+    @property
+    def tournament(self):
+        """Tournament instance, created when the first player asks for one"""
+        return self._get_or_create('_tournament', Tournament)
+
+    @property
+    def auth_manager(self):
+        """Shared user store, partitioned so that each stat update only
+        rewrites the shard file holding that user"""
+        def create():
+            from auth import AuthenticationManager
+            return AuthenticationManager(num_shards=self.num_shards)
+        return self._get_or_create('_auth_manager', create)
+
+    @property
+    def admission(self):
+        """Per-IP and per-username rate limiting in front of the handlers"""
+        def create():
+            from rate_limit import AdmissionController
+            return AdmissionController()
+        return self._get_or_create('_admission', create)
+
+    def handle_player_connection(self, client_socket, address=None):
         """ Handle player authentication and game mode selection """
         # Ensure client_socket is valid before using it
         if not client_socket:
             print("Invalid client socket received")
             return
 
-        # Create authentication manager
-        auth_manager = AuthenticationManager()
+        auth_manager = self.auth_manager
+        ip = address[0] if address else None
         
         try:
             # Send login/register prompt
@@ -377,6 +850,11 @@ class RockPaperScissorsServer:
                 
                 action, username, password = parts
                 
+                # Reject over-limit attempts before touching the user database
+                if not self.admission.admit_auth(ip, username):
+                    client_socket.send("Too many attempts. Please wait and try again.".encode())
+                    continue
+                
                 if action.upper() == 'REGISTER':
                     if auth_manager.register_user(username, password):
                         client_socket.send("Registration successful!".encode())
@@ -387,8 +865,12 @@ class RockPaperScissorsServer:
                 elif action.upper() == 'LOGIN':
                     if auth_manager.authenticate_user(username, password):
                         authenticated = True
+                        # Resume a game this player dropped out of
+                        if self.sessions.reattach(username, client_socket):
+                            return
                         client_socket.send("Login successful!".encode())
                     else:
+                        self.admission.record_failed_login(username)
                         client_socket.send("Invalid credentials".encode())
                         continue
                 
@@ -433,13 +915,14 @@ class RockPaperScissorsServer:
                     player1[0].send(f"Match found! You'll be playing against {player2[1]}".encode())
                     player2[0].send(f"Match found! You'll be playing against {player1[1]}".encode())
                     
-                    # Create and start a normal game session
-                    game_session = GameSession(player1, player2)
-                    session_thread = threading.Thread(target=game_session.play_game)
+                    # Create and start a normal game session; it registers
+                    # itself so dropped players can resume it
+                    game_session = GameSession(
+                        player1, player2, self.auth_manager, self.rules,
+                        registry=self.sessions
+                    )
+                    session_thread = threading.Thread(target=game_session.play_game, daemon=True)
                     session_thread.start()
-                    
-                    # Keep track of active sessions
-                    self.active_sessions.append(session_thread)
                 
                 # Small sleep to prevent tight loop and reduce CPU usage
                 time.sleep(1)
@@ -466,10 +949,18 @@ class RockPaperScissorsServer:
                     client_socket, address = self.server_socket.accept()
                     print(f"Connection from {address}")
 
+                    # Drop connections from flooding IPs before spawning a thread
+                    if not self.admission.admit_connection(address[0]):
+                        try:
+                            client_socket.close()
+                        except:
+                            pass
+                        continue
+
                     # Handle each connection in a separate thread
                     connection_thread = threading.Thread(
                         target=self.handle_player_connection, 
-                        args=(client_socket,)
+                        args=(client_socket, address)
                     )
                     connection_thread.start()
 
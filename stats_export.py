@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+import sys
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+from auth import AuthenticationManager
+
+# Column layouts: 'str' columns are newline-delimited UTF-8, every other
+# column is a raw array of the given array typecode
+USER_COLUMNS = [
+    ('username', 'str'),
+    ('total_games', 'q'),
+    ('wins', 'q'),
+    ('losses', 'q'),
+    ('rank', 'q')
+]
+MATCH_COLUMNS = [
+    ('timestamp', 'd'),
+    ('player1', 'str'),
+    ('player2', 'str'),
+    ('score1', 'i'),
+    ('score2', 'i')
+]
+
+FORMAT_NAME = 'rps-columnar'
+FORMAT_VERSION = 1
+BYTEORDER = 'little'
+RANK_BUCKET = 100
+
+def batched(rows: Iterable[Tuple], batch_size: int) -> Iterator[List[Tuple]]:
+    """Group a row stream into lists of at most batch_size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def user_rows(auth_manager: AuthenticationManager) -> Iterator[Tuple]:
+    """Stream user stat rows in USER_COLUMNS order, without password hashes"""
+    for username, stats in auth_manager.iter_user_stats():
+        yield (username, stats['total_games'], stats['wins'], stats['losses'], stats['rank'])
+
+def match_rows(auth_manager: AuthenticationManager) -> Iterator[Tuple]:
+    """Stream match history rows in MATCH_COLUMNS order"""
+    for match in auth_manager.iter_matches():
+        yield (match['timestamp'], match['player1'], match['player2'], match['score1'], match['score2'])
+
+class ColumnarWriter:
+    def __init__(self, directory: str, columns: List[Tuple[str, str]]):
+        """
+        Append-only writer for one columnar table
+        
+        Args:
+            directory (str): Directory holding one file per column
+            columns (List[Tuple[str, str]]): Column names and typecodes
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = columns
+        self.rows = 0
+        self.files = [
+            open(os.path.join(directory, f"{name}.{typecode}"),
+                 'w' if typecode == 'str' else 'wb',
+                 **({'encoding': 'utf-8', 'newline': '\n'} if typecode == 'str' else {}))
+            for name, typecode in columns
+        ]
+    
+    def write_batch(self, rows: List[Tuple]) -> None:
+        """
+        Transpose a batch of rows and append it to every column file
+        
+        Args:
+            rows (List[Tuple]): Rows in column order
+        """
+        for index, ((name, typecode), f) in enumerate(zip(self.columns, self.files)):
+            if typecode == 'str':
+                f.write('\n'.join(str(row[index]) for row in rows))
+                f.write('\n')
+            else:
+                values = array(typecode, (row[index] for row in rows))
+                if sys.byteorder != BYTEORDER:
+                    values.byteswap()
+                values.tofile(f)
+        self.rows += len(rows)
+    
+    def close(self) -> Dict:
+        """
+        Close all column files
+        
+        Returns:
+            Dict: Table entry for the export manifest
+        """
+        for f in self.files:
+            f.close()
+        return {'rows': self.rows, 'columns': dict(self.columns)}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        for f in self.files:
+            if not f.closed:
+                f.close()
+
+def write_table(directory: str, columns: List[Tuple[str, str]], rows: Iterable[Tuple], batch_size: int) -> Dict:
+    """Write a row stream as a columnar table, one batch in memory at a time"""
+    with ColumnarWriter(directory, columns) as writer:
+        for batch in batched(rows, batch_size):
+            writer.write_batch(batch)
+        return writer.close()
+
+def write_manifest(out_dir: str, tables: Dict) -> Dict:
+    """Write the manifest describing every exported table"""
+    manifest = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'byteorder': BYTEORDER,
+        'tables': tables
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+def export_stats(auth_manager: AuthenticationManager, out_dir: str, batch_size: int = 65536) -> Dict:
+    """
+    Export user stats and match history to a columnar directory
+    
+    Args:
+        auth_manager (AuthenticationManager): Store to export from
+        out_dir (str): Output directory
+        batch_size (int): Rows buffered per column write
+    
+    Returns:
+        Dict: The written manifest
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tables = {
+        'users': write_table(os.path.join(out_dir, 'users'), USER_COLUMNS,
+                             user_rows(auth_manager), batch_size),
+        'matches': write_table(os.path.join(out_dir, 'matches'), MATCH_COLUMNS,
+                               match_rows(auth_manager), batch_size)
+    }
+    return write_manifest(out_dir, tables)
+
+def read_column(out_dir: str, table: str, name: str, chunk_rows: int = 1 << 20) -> Iterator:
+    """
+    Stream a numeric column in chunks
+    
+    Args:
+        out_dir (str): Export directory
+        table (str): Table name
+        name (str): Column name
+        chunk_rows (int): Values read per chunk
+    
+    Yields:
+        array: Chunk of column values
+    """
+    with open(os.path.join(out_dir, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    
+    typecode = manifest['tables'][table]['columns'][name]
+    swap = sys.byteorder != manifest['byteorder']
+    with open(os.path.join(out_dir, table, f"{name}.{typecode}"), 'rb') as f:
+        while True:
+            chunk = array(typecode)
+            try:
+                chunk.fromfile(f, chunk_rows)
+            except EOFError:
+                # Short final chunk; fromfile keeps the values it did read
+                pass
+            if not chunk:
+                return
+            if swap:
+                chunk.byteswap()
+            yield chunk
+
+def query_stats(out_dir: str) -> Dict:
+    """
+    Compute aggregate statistics over an export
+    
+    Args:
+        out_dir (str): Export directory
+    
+    Returns:
+        Dict: Win-rate, rank distribution and match aggregates
+    """
+    users = 0
+    active_users = 0
+    win_rate_sum = 0.0
+    rank_min, rank_max, rank_sum = None, None, 0
+    rank_buckets = Counter()
+    
+    columns = zip(
+        read_column(out_dir, 'users', 'total_games'),
+        read_column(out_dir, 'users', 'wins'),
+        read_column(out_dir, 'users', 'rank')
+    )
+    for total_games, wins, ranks in columns:
+        users += len(ranks)
+        win_rate_sum += sum(w / g for w, g in zip(wins, total_games) if g)
+        active_users += len(total_games) - total_games.count(0)
+        
+        rank_sum += sum(ranks)
+        chunk_min, chunk_max = min(ranks), max(ranks)
+        rank_min = chunk_min if rank_min is None else min(rank_min, chunk_min)
+        rank_max = chunk_max if rank_max is None else max(rank_max, chunk_max)
+        rank_buckets.update(rank // RANK_BUCKET * RANK_BUCKET for rank in ranks)
+    
+    matches = 0
+    ties = 0
+    rounds = 0
+    for score1, score2 in zip(read_column(out_dir, 'matches', 'score1'),
+                              read_column(out_dir, 'matches', 'score2')):
+        matches += len(score1)
+        ties += sum(1 for a, b in zip(score1, score2) if a == b)
+        rounds += sum(score1) + sum(score2)
+    
+    return {
+        'users': users,
+        'active_users': active_users,
+        'mean_win_rate': win_rate_sum / active_users if active_users else 0.0,
+        'rank_min': rank_min,
+        'rank_max': rank_max,
+        'rank_mean': rank_sum / users if users else 0.0,
+        'rank_distribution': dict(sorted(rank_buckets.items())),
+        'matches': matches,
+        'tie_rate': ties / matches if matches else 0.0,
+        'mean_decided_rounds': rounds / matches if matches else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and query player statistics")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    export_parser = subparsers.add_parser('export', help="write user stats and match history to columnar files")
+    export_parser.add_argument('out_dir')
+    export_parser.add_argument('--database', default='users.json')
+    export_parser.add_argument('--batch-size', type=int, default=65536)
+    
+    query_parser = subparsers.add_parser('query', help="compute aggregates over an export")
+    query_parser.add_argument('out_dir')
+    
+    args = parser.parse_args()
+    if args.command == 'export':
+        # Open the existing store only; a wrong path must not create an empty one
+        try:
+            auth_manager = AuthenticationManager(args.database, create=False)
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+        manifest = export_stats(auth_manager, args.out_dir, args.batch_size)
+        for table, entry in manifest['tables'].items():
+            print(f"Exported {entry['rows']} {table} rows to {os.path.join(args.out_dir, table)}")
+    else:
+        print(json.dumps(query_stats(args.out_dir), indent=4))
+
+if __name__ == "__main__":
+    main()
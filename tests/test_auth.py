@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from auth import AuthenticationManager, _iter_json_object
+
+class ShardedStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.tmp_dir.name, 'users.json')
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def files(self):
+        return sorted(os.listdir(self.tmp_dir.name))
+    
+    def shard_files(self, count):
+        return [f"users.shard{i}.json" for i in range(count)]
+    
+    def test_legacy_database_is_split_into_shards(self):
+        legacy = AuthenticationManager(self.database_path)
+        usernames = [f"player{i}" for i in range(50)]
+        for username in usernames:
+            legacy.register_user(username, 'password')
+        os.remove(legacy.meta_path)
+        
+        sharded = AuthenticationManager(self.database_path, num_shards=4)
+        
+        self.assertEqual(
+            self.files(),
+            sorted(['users.json', 'users.meta.json'] + self.shard_files(4))
+        )
+        with open(sharded.meta_path) as f:
+            self.assertEqual(json.load(f), {'num_shards': 4})
+        for username in usernames:
+            self.assertTrue(sharded.authenticate_user(username, 'password'))
+        self.assertEqual(sum(1 for _ in sharded.iter_user_stats()), len(usernames))
+    
+    def test_shard_count_mismatch_is_refused(self):
+        AuthenticationManager(self.database_path, num_shards=8).register_user('alice', 'password')
+        
+        with self.assertRaises(ValueError):
+            AuthenticationManager(self.database_path, num_shards=4)
+        
+        # The store is left untouched and opens with its stored count
+        self.assertEqual(self.files(), sorted(['users.meta.json'] + self.shard_files(8)))
+        reopened = AuthenticationManager(self.database_path)
+        self.assertEqual(reopened.num_shards, 8)
+        self.assertTrue(reopened.authenticate_user('alice', 'password'))
+    
+    def test_shard_count_is_inferred_without_metadata(self):
+        store = AuthenticationManager(self.database_path, num_shards=3)
+        os.remove(store.meta_path)
+        
+        self.assertEqual(AuthenticationManager(self.database_path).num_shards, 3)
+        with self.assertRaises(ValueError):
+            AuthenticationManager(self.database_path, num_shards=2)
+    
+    def test_reshard_moves_users_and_removes_old_shards(self):
+        store = AuthenticationManager(self.database_path, num_shards=8)
+        usernames = [f"player{i}" for i in range(50)]
+        for username in usernames:
+            store.register_user(username, 'password')
+        store.update_user_stats('player0', True)
+        
+        resharded = AuthenticationManager(self.database_path, num_shards=3, reshard=True)
+        
+        self.assertEqual(self.files(), sorted(['users.meta.json'] + self.shard_files(3)))
+        for username in usernames:
+            self.assertTrue(resharded.authenticate_user(username, 'password'))
+        self.assertEqual(resharded.get_user_stats('player0')['wins'], 1)
+        self.assertEqual(AuthenticationManager(self.database_path).num_shards, 3)
+    
+    def test_missing_store_is_not_created_when_read_only(self):
+        with self.assertRaises(FileNotFoundError):
+            AuthenticationManager(self.database_path, create=False)
+        self.assertEqual(self.files(), [])
+    
+    def test_concurrent_updates_are_not_lost(self):
+        store = AuthenticationManager(self.database_path, num_shards=4)
+        usernames = [f"player{i}" for i in range(8)]
+        for username in usernames:
+            store.register_user(username, 'password')
+        
+        def writer():
+            # A separate manager per thread shares the process-wide shard locks
+            manager = AuthenticationManager(self.database_path)
+            for i in range(50):
+                manager.update_user_stats(usernames[i % len(usernames)], i % 2 == 0)
+        
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = [store.get_user_stats(username) for username in usernames]
+        self.assertEqual(sum(s['total_games'] for s in stats), 8 * 50)
+        self.assertEqual(sum(s['wins'] for s in stats), 8 * 25)
+
+class StreamingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.tmp_dir.name, 'users.json')
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def test_members_decode_across_chunk_boundaries(self):
+        path = os.path.join(self.tmp_dir.name, 'object.json')
+        documents = [
+            {},
+            {'a': 1},
+            {'"quoted", {braces}': {'nested': [1, 2.5, None, True]}, 'ü': 'x' * 40},
+            {f"user{i}": {'rank': 1000 + i, 'name': f"\\{i}\""} for i in range(30)}
+        ]
+        for document in documents:
+            for indent in (None, 4):
+                with open(path, 'w') as f:
+                    json.dump(document, f, indent=indent)
+                for chunk_size in (1, 3, 7, 1 << 16):
+                    with open(path, 'r') as f:
+                        decoded = dict(_iter_json_object(f, chunk_size))
+                    self.assertEqual(decoded, document)
+    
+    def test_malformed_object_raises(self):
+        path = os.path.join(self.tmp_dir.name, 'object.json')
+        for text in ('[]', '{"a": 1', '{"a" 1}', '{"a": 1 "b": 2}'):
+            with open(path, 'w') as f:
+                f.write(text)
+            with open(path, 'r') as f, self.assertRaises(ValueError):
+                list(_iter_json_object(f, 2))
+    
+    def test_iter_user_stats_memory_does_not_grow_with_users(self):
+        # Write the shard directly; registering this many users one by one is slow
+        users = {
+            f"player{i}": {'password': 'x' * 64, 'total_games': i, 'wins': i, 'losses': 0, 'rank': 1000}
+            for i in range(20000)
+        }
+        with open(self.database_path, 'w') as f:
+            json.dump(users, f, indent=4)
+        size = os.path.getsize(self.database_path)
+        store = AuthenticationManager(self.database_path, create=False)
+        
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in store.iter_user_stats())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        self.assertEqual(count, len(users))
+        self.assertLess(peak, size / 10)
+    
+    def test_stores_in_one_directory_keep_separate_match_history(self):
+        first = AuthenticationManager(self.database_path)
+        second = AuthenticationManager(os.path.join(self.tmp_dir.name, 'other.json'))
+        first.record_match('alice', 'bob', 2, 1)
+        
+        self.assertNotEqual(first.matches_path, second.matches_path)
+        self.assertEqual([m['player1'] for m in first.iter_matches()], ['alice'])
+        self.assertEqual(list(second.iter_matches()), [])
+
+if __name__ == "__main__":
+    unittest.main()
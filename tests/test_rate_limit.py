@@ -0,0 +1,118 @@
+import unittest
+from rate_limit import AdmissionController, BucketMap, TokenBucket
+
+class TokenBucketTest(unittest.TestCase):
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket(rate=2.0, capacity=4, now=0.0)
+        for _ in range(4):
+            self.assertTrue(bucket.consume(0.0))
+        self.assertFalse(bucket.consume(0.0))
+        
+        # Half a second at 2 tokens per second buys one more request
+        self.assertTrue(bucket.consume(0.5))
+        self.assertFalse(bucket.consume(0.5))
+        
+        self.assertEqual(bucket.refill(100.0), 4)
+    
+    def test_time_going_backwards_adds_nothing(self):
+        bucket = TokenBucket(rate=1.0, capacity=1, now=10.0)
+        self.assertTrue(bucket.consume(10.0))
+        self.assertFalse(bucket.consume(5.0))
+        self.assertEqual(bucket.updated, 10.0)
+
+class BucketMapTest(unittest.TestCase):
+    def test_keys_are_limited_independently(self):
+        buckets = BucketMap(rate=1.0, capacity=1)
+        self.assertTrue(buckets.consume('a', 0.0))
+        self.assertFalse(buckets.consume('a', 0.0))
+        self.assertTrue(buckets.consume('b', 0.0))
+    
+    def test_idle_buckets_are_evicted(self):
+        buckets = BucketMap(rate=1.0, capacity=2)
+        buckets.consume('a', 0.0)
+        buckets.consume('b', 1.0)
+        
+        # 'a' has been idle for the 2s it takes to refill, 'b' has not
+        buckets.consume('c', 2.5)
+        self.assertEqual(list(buckets.buckets), ['b', 'c'])
+        self.assertEqual(buckets.evictions, 1)
+    
+    def test_least_recently_used_bucket_is_evicted_when_full(self):
+        buckets = BucketMap(rate=1.0, capacity=10, max_entries=2)
+        buckets.consume('a', 0.0)
+        buckets.consume('b', 0.0)
+        buckets.consume('a', 0.1)
+        buckets.consume('c', 0.2)
+        
+        self.assertEqual(list(buckets.buckets), ['a', 'c'])
+        self.assertEqual(len(buckets), 2)
+        self.assertEqual(buckets.evictions, 1)
+    
+    def test_has_tokens_does_not_consume_or_create(self):
+        buckets = BucketMap(rate=1.0, capacity=1)
+        self.assertTrue(buckets.has_tokens('a', 0.0))
+        self.assertEqual(len(buckets), 0)
+        
+        buckets.consume('a', 0.0)
+        self.assertFalse(buckets.has_tokens('a', 0.0))
+        self.assertTrue(buckets.has_tokens('a', 1.0))
+        self.assertTrue(buckets.consume('a', 1.0))
+
+class AdmissionControllerTest(unittest.TestCase):
+    def test_connection_limit_and_counter(self):
+        admission = AdmissionController(connection_rate=1.0, connection_burst=2)
+        self.assertTrue(admission.admit_connection('1.1.1.1', now=0.0))
+        self.assertTrue(admission.admit_connection('1.1.1.1', now=0.0))
+        self.assertFalse(admission.admit_connection('1.1.1.1', now=0.0))
+        self.assertTrue(admission.admit_connection('2.2.2.2', now=0.0))
+        
+        stats = admission.get_stats()
+        self.assertEqual(stats['connections_rejected'], 1)
+        self.assertEqual(stats['tracked_ips'], 2)
+    
+    def test_ip_username_limit_does_not_affect_other_addresses(self):
+        admission = AdmissionController(ip_username_rate=0.1, ip_username_burst=2)
+        for _ in range(2):
+            self.assertTrue(admission.admit_auth('1.1.1.1', 'alice', now=0.0))
+        self.assertFalse(admission.admit_auth('1.1.1.1', 'alice', now=0.0))
+        self.assertTrue(admission.admit_auth('2.2.2.2', 'alice', now=0.0))
+        
+        stats = admission.get_stats()
+        self.assertEqual(stats['auth_rejected_ip_username'], 1)
+        self.assertEqual(stats['tracked_ip_usernames'], 2)
+    
+    def test_failed_logins_from_many_addresses_lock_the_username(self):
+        admission = AdmissionController(failed_login_rate=0.1, failed_login_burst=3)
+        for i in range(3):
+            ip = f"10.0.0.{i}"
+            self.assertTrue(admission.admit_auth(ip, 'alice', now=0.0))
+            admission.record_failed_login('alice', now=0.0)
+        
+        self.assertFalse(admission.admit_auth('10.0.0.99', 'alice', now=0.0))
+        self.assertTrue(admission.admit_auth('10.0.0.99', 'bob', now=0.0))
+        # The lockout wears off at the failed-login refill rate
+        self.assertTrue(admission.admit_auth('10.0.0.99', 'alice', now=10.0))
+        
+        stats = admission.get_stats()
+        self.assertEqual(stats['failed_logins'], 3)
+        self.assertEqual(stats['auth_rejected_username'], 1)
+        self.assertEqual(stats['tracked_usernames'], 1)
+    
+    def test_successful_attempts_are_not_charged_to_the_username(self):
+        admission = AdmissionController(auth_burst=100, ip_username_burst=100, failed_login_burst=1)
+        for _ in range(10):
+            self.assertTrue(admission.admit_auth('1.1.1.1', 'alice', now=0.0))
+        self.assertTrue(admission.admit_auth('2.2.2.2', 'alice', now=0.0))
+        self.assertEqual(admission.get_stats()['tracked_usernames'], 0)
+    
+    def test_ip_limit_is_checked_first(self):
+        admission = AdmissionController(auth_rate=0.1, auth_burst=1)
+        self.assertTrue(admission.admit_auth('1.1.1.1', 'alice', now=0.0))
+        self.assertFalse(admission.admit_auth('1.1.1.1', 'bob', now=0.0))
+        
+        stats = admission.get_stats()
+        self.assertEqual(stats['auth_rejected_ip'], 1)
+        self.assertEqual(stats['auth_rejected_ip_username'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from auth import AuthenticationManager
+from scheduler import DeadlineScheduler
+from server import GameRules, GameSession, SessionRegistry
+
+PROMPT = b"(1/2/3): "
+
+class Player:
+    """Client end of a socketpair seated in a session"""
+    
+    def __init__(self):
+        self.server_end, self.sock = socket.socketpair()
+        self.sock.settimeout(5)
+        self.received = b''
+    
+    def read_until(self, marker):
+        """Read until marker arrives, returning everything received so far"""
+        while marker not in self.received:
+            data = self.sock.recv(65536)
+            if not data:
+                raise AssertionError(f"connection closed before {marker!r}: {self.received!r}")
+            self.received += data
+        return self.received
+    
+    def read_all(self):
+        """Read until the session closes the connection"""
+        while True:
+            data = self.sock.recv(65536)
+            if not data:
+                return self.received.decode()
+            self.received += data
+    
+    def move(self, choice):
+        """Wait for the next move prompt and answer it"""
+        self.read_until(PROMPT)
+        self.received = self.received.split(PROMPT, 1)[1]
+        self.sock.send(choice)
+
+class SessionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.auth_manager = AuthenticationManager(os.path.join(self.tmp_dir.name, 'users.json'))
+        for username in ('alice', 'bob'):
+            self.auth_manager.register_user(username, 'password')
+        
+        self.scheduler = DeadlineScheduler()
+        self.scheduler.start()
+        self.registry = SessionRegistry()
+        self.alice = Player()
+        self.bob = Player()
+    
+    def tearDown(self):
+        self.scheduler.stop()
+        for player in (self.alice, self.bob):
+            player.sock.close()
+        self.tmp_dir.cleanup()
+    
+    def start_session(self, rules):
+        self.session = GameSession(
+            (self.alice.server_end, 'alice'), (self.bob.server_end, 'bob'),
+            self.auth_manager, rules, self.scheduler, self.registry
+        )
+        self.thread = threading.Thread(target=self.session.play_game, daemon=True)
+        self.thread.start()
+    
+    def join_session(self):
+        self.thread.join(10)
+        self.assertFalse(self.thread.is_alive(), "session did not finish")
+    
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "condition not reached")
+            time.sleep(0.01)
+    
+    def test_reattached_player_resumes_series(self):
+        self.start_session(GameRules(move_timeout=5, reconnect_grace=5))
+        
+        self.alice.read_until(PROMPT)
+        self.alice.sock.close()
+        self.bob.read_until(b"alice disconnected")
+        
+        self.alice = Player()
+        self.assertTrue(self.registry.reattach('alice', self.alice.server_end))
+        self.alice.read_until(b"Reconnected to your game in progress")
+        self.bob.read_until(b"alice reconnected.")
+        
+        for _ in range(2):
+            self.alice.move(b'1')
+            self.bob.move(b'3')
+        
+        self.assertIn("You won the series 2-0", self.alice.read_all())
+        self.assertIn("You lost the series 2-0", self.bob.read_all())
+        self.join_session()
+        self.assertEqual(self.auth_manager.get_user_stats('alice')['wins'], 1)
+        self.assertEqual(self.auth_manager.get_user_stats('bob')['losses'], 1)
+    
+    def test_player_dropping_after_their_move_can_reattach(self):
+        self.start_session(GameRules(move_timeout=5, reconnect_grace=5))
+        
+        # The session stops reading alice's socket once she has moved, so it
+        # does not notice the drop before she logs in again
+        self.alice.move(b'1')
+        self.bob.read_until(PROMPT)
+        self.wait_for(lambda: 'alice' in self.session.moves)
+        self.alice.sock.close()
+        
+        self.alice = Player()
+        self.assertTrue(self.registry.reattach('alice', self.alice.server_end))
+        self.alice.read_until(b"Reconnected to your game in progress")
+        self.bob.read_until(b"alice reconnected.")
+        self.bob.move(b'3')
+        self.alice.read_until(b"Round 1 - You won!")
+        
+        self.alice.move(b'1')
+        self.bob.move(b'3')
+        self.assertIn("You won the series 2-0", self.alice.read_all())
+        self.join_session()
+        self.assertEqual(self.auth_manager.get_user_stats('alice')['wins'], 1)
+    
+    def test_relogin_replaces_half_open_connection(self):
+        self.start_session(GameRules(move_timeout=5, reconnect_grace=5))
+        
+        # The old connection is never closed from the client side, as after
+        # a network outage; the new login takes the seat over
+        old_alice = self.alice
+        old_alice.read_until(PROMPT)
+        self.alice = Player()
+        self.assertTrue(self.registry.reattach('alice', self.alice.server_end))
+        self.alice.read_until(b"Reconnected to your game in progress")
+        self.assertEqual(old_alice.sock.recv(65536, socket.MSG_PEEK), b'')
+        
+        for _ in range(2):
+            self.alice.move(b'1')
+            self.bob.move(b'3')
+        self.assertIn("You won the series 2-0", self.alice.read_all())
+        self.join_session()
+        old_alice.sock.close()
+    
+    def test_grace_expiry_forfeits_series(self):
+        self.start_session(GameRules(move_timeout=2, reconnect_grace=0.5, forfeit_on_timeout=True))
+        
+        self.alice.read_until(PROMPT)
+        self.bob.read_until(PROMPT)
+        start = time.monotonic()
+        self.alice.sock.close()
+        
+        output = self.bob.read_all()
+        self.join_session()
+        
+        # The round ends when the grace window does, without charging bob
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertIn("Round 1 - alice disconnected.", output)
+        self.assertNotIn("bob ran out of time", output)
+        self.assertIn("You won the series by forfeit.\nFinal Score - bob: 0, alice: 0", output)
+        self.assertEqual(self.session.forfeited, {0})
+        self.assertEqual(self.auth_manager.get_user_stats('bob')['wins'], 1)
+        self.assertEqual(self.auth_manager.get_user_stats('alice')['losses'], 1)
+    
+    def test_registry_empty_after_session(self):
+        self.start_session(GameRules(move_timeout=5, reconnect_grace=5))
+        self.assertEqual(len(self.registry), 1)
+        
+        for _ in range(2):
+            self.alice.move(b'2')
+            self.bob.move(b'1')
+        self.alice.read_all()
+        self.join_session()
+        
+        self.assertEqual(len(self.registry), 0)
+        late_socket, other_end = socket.socketpair()
+        self.assertFalse(self.registry.reattach('alice', late_socket))
+        late_socket.close()
+        other_end.close()
+        self.assertEqual(self.scheduler.pending(), 0)
+
+if __name__ == "__main__":
+    unittest.main()